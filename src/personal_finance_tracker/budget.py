@@ -0,0 +1,168 @@
+import hashlib
+import json
+import pandas as pd
+from datetime import date, datetime
+
+# strftime format giving the period key of a date for each budget period
+PERIODS = {
+    'weekly': '%G-W%V',
+    'monthly': '%Y-%m',
+    'yearly': '%Y',
+}
+
+def _is_blank(value):
+    return value is None or value == '' or (not isinstance(value, str) and pd.isna(value))
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+class BudgetTracker:
+    def __init__(self, budgets=None):
+        self.budgets = {}
+        # Budgets indexed by category so a transaction only visits the budgets it can affect
+        self._by_category = {}
+        self._all_categories = []
+        # Running spend per (budget name, period key)
+        self.spend = {}
+        self.loaded = True
+        for budget in budgets or []:
+            self.add_budget(budget)
+
+    def add_budget(self, budget):
+        """Register a budget from a name, limit and optional category, account_id, period
+        and alert_threshold"""
+        if _is_blank(budget.get('name')):
+            raise ValueError("Budget name is required")
+        name = str(budget['name'])
+        if _is_blank(budget.get('limit')):
+            raise ValueError(f"Budget limit is required: {name}")
+        period = 'monthly' if _is_blank(budget.get('period')) else budget['period']
+        if period not in PERIODS:
+            raise ValueError(f"Unknown budget period: {period}")
+        threshold = budget.get('alert_threshold')
+        budget = {
+            'name': name,
+            'category': None if _is_blank(budget.get('category')) else budget['category'],
+            'account_id': None if _is_blank(budget.get('account_id')) else budget['account_id'],
+            'period': period,
+            'limit': float(budget['limit']),
+            'alert_threshold': 0.8 if _is_blank(threshold) else float(threshold)
+        }
+        if name in self.budgets:
+            raise ValueError(f"Budget already exists: {name}")
+
+        self.budgets[name] = budget
+        if budget['category'] is None:
+            self._all_categories.append(budget)
+        else:
+            self._by_category.setdefault(budget['category'], []).append(budget)
+        # Spend for the new budget has to be rebuilt from the stored transactions
+        self.loaded = False
+
+    def load(self, transactions_df):
+        """Rebuild running spend totals from all stored transactions"""
+        self.spend = {}
+        if self.budgets and not transactions_df.empty:
+            amounts = pd.to_numeric(transactions_df['amount']).to_numpy()
+            # Work out dates and category matches once per distinct value rather than per row
+            date_codes, date_values = pd.factorize(transactions_df['date'])
+            days = [_to_date(value) for value in date_values]
+            category_codes, category_values = pd.factorize(transactions_df['category'])
+            period_keys = {}
+
+            for name, budget in self.budgets.items():
+                # Only outflows count as spend
+                mask = amounts > 0
+                if budget['account_id'] is not None:
+                    mask = mask & (transactions_df['account_id'] == budget['account_id']).to_numpy()
+                if budget['category'] is not None:
+                    category = budget['category']
+                    matches = pd.Series(
+                        [category in str(value).split(', ') for value in category_values] + [False]
+                    )
+                    # factorize codes blank categories as -1, which picks the trailing False
+                    mask = mask & matches.iloc[category_codes].to_numpy()
+                if not mask.any():
+                    continue
+
+                period = budget['period']
+                if period not in period_keys:
+                    keys = pd.Series([day.strftime(PERIODS[period]) for day in days])
+                    period_keys[period] = keys.iloc[date_codes].to_numpy()
+                totals = pd.Series(amounts[mask]).groupby(period_keys[period][mask]).sum()
+                for period_key, total in totals.items():
+                    self.spend[(name, period_key)] = float(total)
+        self.loaded = True
+
+    def fingerprint(self):
+        """Hash the budget fields that decide which transactions count towards spend"""
+        definitions = sorted(
+            [b['name'], b['category'], b['account_id'], b['period']]
+            for b in self.budgets.values()
+        )
+        return hashlib.sha256(json.dumps(definitions).encode()).hexdigest()
+
+    def restore(self, records):
+        """Restore running spend totals saved with to_records()"""
+        self.spend = {(name, period_key): float(total) for name, period_key, total in records}
+        self.loaded = True
+
+    def to_records(self):
+        """Get running spend totals as [budget, period, spend] lists for saving"""
+        return [[name, period_key, total] for (name, period_key), total in self.spend.items()]
+
+    def add_transaction(self, row):
+        """Count a new transaction row towards its budgets, returning any alerts"""
+        alerts = []
+        amount = float(row['amount'])
+        # Only outflows count as spend
+        if amount <= 0:
+            return alerts
+        budgets = self._matching_budgets(row)
+        if not budgets:
+            return alerts
+
+        trans_date = _to_date(row['date'])
+        for budget in budgets:
+            period_key = trans_date.strftime(PERIODS[budget['period']])
+            key = (budget['name'], period_key)
+            before = self.spend.get(key, 0.0)
+            after = before + amount
+            self.spend[key] = after
+            alerts.extend(self._check_thresholds(budget, period_key, before, after))
+        return alerts
+
+    def remaining(self, on_date=None):
+        """Get the amount left in each budget for the period containing on_date"""
+        on_date = _to_date(on_date or date.today())
+        result = {}
+        for name, budget in self.budgets.items():
+            key = (name, on_date.strftime(PERIODS[budget['period']]))
+            result[name] = budget['limit'] - self.spend.get(key, 0.0)
+        return result
+
+    def _matching_budgets(self, row):
+        budgets = list(self._all_categories)
+        if not _is_blank(row.get('category')):
+            for category in dict.fromkeys(str(row['category']).split(', ')):
+                budgets.extend(self._by_category.get(category, []))
+        return [
+            b for b in budgets
+            if b['account_id'] is None or b['account_id'] == row.get('account_id')
+        ]
+
+    def _check_thresholds(self, budget, period_key, before, after):
+        """Report each alert level that spend crossed on the way up"""
+        alerts = []
+        for level in sorted({budget['alert_threshold'], 1.0}):
+            mark = level * budget['limit']
+            if before < mark <= after:
+                alerts.append(
+                    f"Budget '{budget['name']}' reached {level:.0%} of "
+                    f"${budget['limit']:.2f} for {period_key} (spent ${after:.2f})"
+                )
+        return alerts
@@ -9,6 +9,9 @@ PLAID_CLIENT_ID = os.getenv('PLAID_CLIENT_ID')
 PLAID_SECRET = os.getenv('PLAID_SECRET')
 PLAID_ENV = os.getenv('PLAID_ENV', 'sandbox')
 
+# Set to 1 to include cProfile/tracemalloc output in the run metrics
+PROFILE = os.getenv('PROFILE', '0') == '1'
+
 # Create data directory in project root
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / 'data'
@@ -17,4 +20,7 @@ DATA_DIR.mkdir(exist_ok=True)
 # File paths
 TRANSACTIONS_FILE = DATA_DIR / 'transactions.tsv'
 BALANCES_FILE = DATA_DIR / 'balances.tsv'
+METRICS_FILE = DATA_DIR / 'metrics.jsonl'
+BUDGETS_FILE = DATA_DIR / 'budgets.tsv'
+BUDGET_SPEND_FILE = DATA_DIR / 'budget_spend.json'
 
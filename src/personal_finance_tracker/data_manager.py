@@ -1,14 +1,34 @@
+import hashlib
+import json
 import pandas as pd
 from datetime import datetime
 from . import config
+from .instrumentation import Instrumentation
+from .budget import BudgetTracker
+
+def _file_stamp(path):
+    """Size and modification time of a file, used to spot changes made outside DataManager"""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+def _file_digest(path):
+    """Hash of a small file's contents, used to spot changes made outside DataManager"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation or Instrumentation()
         # Initialize files if they don't exist
         if not config.TRANSACTIONS_FILE.exists():
             self.init_transactions_file()
         if not config.BALANCES_FILE.exists():
             self.init_balances_file()
+        if not config.BUDGETS_FILE.exists():
+            self.init_budgets_file()
+        # File stamp of transactions.tsv that the running budget spend matches
+        self._transactions_stamp = None
+        self.load_budgets()
+        self.load_budget_spend()
 
     def init_transactions_file(self):
         """Initialize transactions TSV file with headers"""
@@ -28,61 +48,180 @@ class DataManager:
         df = pd.DataFrame(columns=headers)
         df.to_csv(config.BALANCES_FILE, sep='\t', index=False)
 
+    def init_budgets_file(self):
+        """Initialize budgets TSV file with headers"""
+        headers = [
+            'name', 'category', 'account_id', 'period', 'limit', 'alert_threshold'
+        ]
+        df = pd.DataFrame(columns=headers)
+        df.to_csv(config.BUDGETS_FILE, sep='\t', index=False)
+
     def save_transactions(self, transactions, accounts):
         """Save new transactions to TSV file"""
         # Load existing data
-        existing_df = pd.read_csv(config.TRANSACTIONS_FILE, sep='\t')
-        existing_ids = set(existing_df['transaction_id'].values)
+        with self.instrumentation.span('data_manager.save_transactions.read'):
+            existing_df = pd.read_csv(config.TRANSACTIONS_FILE, sep='\t')
+            existing_ids = set(existing_df['transaction_id'].values)
+        self.check_budgets()
+        spend_changed = not self.budget_tracker.loaded
+        if spend_changed:
+            with self.instrumentation.span('data_manager.save_transactions.budget_rebuild'):
+                self.budget_tracker.load(existing_df)
 
-        # Create account lookup
-        account_lookup = {acc['account_id']: acc['name'] for acc in accounts}
+        with self.instrumentation.span('data_manager.save_transactions.transform'):
+            # Create account lookup
+            account_lookup = {acc['account_id']: acc['name'] for acc in accounts}
 
-        # Process new transactions
-        new_rows = []
-        for trans in transactions:
-            if trans['transaction_id'] not in existing_ids:
-                row = {
-                    'transaction_id': trans['transaction_id'],
-                    'account_id': trans['account_id'],
-                    'account_name': account_lookup.get(trans['account_id'], 'Unknown'),
-                    'amount': -trans['amount'],  # Plaid uses negative for expenses
-                    'date': trans['date'],
-                    'description': trans['name'],
-                    'category': ', '.join(trans.get('category', [])),
-                    'merchant_name': trans.get('merchant_name', '')
-                }
-                new_rows.append(row)
+            # Process new transactions
+            new_rows = []
+            for trans in transactions:
+                if trans['transaction_id'] not in existing_ids:
+                    row = {
+                        'transaction_id': trans['transaction_id'],
+                        'account_id': trans['account_id'],
+                        'account_name': account_lookup.get(trans['account_id'], 'Unknown'),
+                        'amount': -trans['amount'],  # Plaid uses negative for expenses
+                        'date': trans['date'],
+                        'description': trans['name'],
+                        'category': ', '.join(trans.get('category', [])),
+                        'merchant_name': trans.get('merchant_name', '')
+                    }
+                    new_rows.append(row)
+        self.instrumentation.increment('rows_ingested', len(new_rows))
 
         if new_rows:
-            new_df = pd.DataFrame(new_rows)
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-            combined_df.to_csv(config.TRANSACTIONS_FILE, sep='\t', index=False)
+            with self.instrumentation.span('data_manager.save_transactions.write'):
+                new_df = pd.DataFrame(new_rows)
+                combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+                combined_df.to_csv(config.TRANSACTIONS_FILE, sep='\t', index=False)
+            self.instrumentation.increment('bytes_written', config.TRANSACTIONS_FILE.stat().st_size)
             print(f"Added {len(new_rows)} new transactions")
+
+            # Update budget spend only once the rows are on disk
+            for row in new_rows:
+                for alert in self.budget_tracker.add_transaction(row):
+                    print(alert)
+            spend_changed = True
         else:
             print("No new transactions found")
 
+        if spend_changed:
+            self.save_budget_spend()
+
     def save_balances(self, accounts):
         """Save current account balances"""
-        rows = []
-        for account in accounts:
-            row = {
-                'account_id': account['account_id'],
-                'account_name': account['name'],
-                'account_type': account['type'],
-                'balance_current': account['balances']['current'],
-                'balance_available': account['balances'].get('available', ''),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
-        df.to_csv(config.BALANCES_FILE, sep='\t', index=False)
+        with self.instrumentation.span('data_manager.save_balances.transform'):
+            rows = []
+            for account in accounts:
+                row = {
+                    'account_id': account['account_id'],
+                    'account_name': account['name'],
+                    'account_type': account['type'],
+                    'balance_current': account['balances']['current'],
+                    'balance_available': account['balances'].get('available', ''),
+                    'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+                rows.append(row)
+
+        with self.instrumentation.span('data_manager.save_balances.write'):
+            df = pd.DataFrame(rows)
+            df.to_csv(config.BALANCES_FILE, sep='\t', index=False)
+        self.instrumentation.increment('bytes_written', config.BALANCES_FILE.stat().st_size)
         print(f"Updated balances for {len(rows)} accounts")
 
     def get_latest_balances(self):
         """Get the most recent balance data"""
         try:
-            df = pd.read_csv(config.BALANCES_FILE, sep='\t')
+            with self.instrumentation.span('data_manager.get_latest_balances.read'):
+                df = pd.read_csv(config.BALANCES_FILE, sep='\t')
             return df
         except FileNotFoundError:
             return pd.DataFrame()
+
+    def get_budgets(self):
+        """Get the budget definitions"""
+        try:
+            with self.instrumentation.span('data_manager.get_budgets.read'):
+                return pd.read_csv(config.BUDGETS_FILE, sep='\t')
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    def load_budgets(self):
+        """Create the budget tracker from the budgets TSV file"""
+        self._budgets_digest = _file_digest(config.BUDGETS_FILE)
+        self.budget_tracker = BudgetTracker(self.get_budgets().to_dict('records'))
+
+    def add_budget(self, name, limit, category=None, account_id=None, period='monthly',
+                   alert_threshold=0.8):
+        """Add a budget and save it to the budgets TSV file"""
+        budget = {
+            'name': name,
+            'category': category,
+            'account_id': account_id,
+            'period': period,
+            'limit': limit,
+            'alert_threshold': alert_threshold
+        }
+        self.check_budgets()
+        self.budget_tracker.add_budget(budget)
+
+        df = pd.concat([self.get_budgets(), pd.DataFrame([budget])], ignore_index=True)
+        with self.instrumentation.span('data_manager.add_budget.write'):
+            df.to_csv(config.BUDGETS_FILE, sep='\t', index=False)
+        self._budgets_digest = _file_digest(config.BUDGETS_FILE)
+        self.instrumentation.increment('bytes_written', config.BUDGETS_FILE.stat().st_size)
+
+    def check_budgets(self):
+        """Reload budgets edited since they were loaded, and drop running spend
+        that no longer matches the budgets or the transactions file"""
+        if _file_digest(config.BUDGETS_FILE) != self._budgets_digest:
+            old_tracker = self.budget_tracker
+            self.load_budgets()
+            # Limit and threshold edits don't change which transactions count
+            unchanged = old_tracker.fingerprint() == self.budget_tracker.fingerprint()
+            if old_tracker.loaded and unchanged:
+                self.budget_tracker.restore(old_tracker.to_records())
+        if (self.budget_tracker.budgets
+                and _file_stamp(config.TRANSACTIONS_FILE) != self._transactions_stamp):
+            self.budget_tracker.loaded = False
+
+    def load_budget_spend(self):
+        """Restore saved budget spend if it matches the current budgets and transactions"""
+        try:
+            with self.instrumentation.span('data_manager.load_budget_spend.read'):
+                with open(config.BUDGET_SPEND_FILE) as f:
+                    saved = json.load(f)
+        except FileNotFoundError:
+            return
+        transactions_stamp = _file_stamp(config.TRANSACTIONS_FILE)
+        if (saved['budgets'] != self.budget_tracker.fingerprint()
+                or saved['transactions'] != transactions_stamp):
+            return
+        self.budget_tracker.restore(saved['spend'])
+        self._transactions_stamp = transactions_stamp
+
+    def save_budget_spend(self):
+        """Save running budget spend with the budgets and transactions it was computed from"""
+        if not self.budget_tracker.budgets:
+            return
+        self._transactions_stamp = _file_stamp(config.TRANSACTIONS_FILE)
+        saved = {
+            'budgets': self.budget_tracker.fingerprint(),
+            'transactions': self._transactions_stamp,
+            'spend': self.budget_tracker.to_records()
+        }
+        with self.instrumentation.span('data_manager.save_budget_spend.write'):
+            with open(config.BUDGET_SPEND_FILE, 'w') as f:
+                json.dump(saved, f)
+        self.instrumentation.increment('bytes_written', config.BUDGET_SPEND_FILE.stat().st_size)
+
+    def get_budget_status(self, on_date=None):
+        """Get the amount left in each budget for the current period"""
+        self.check_budgets()
+        if not self.budget_tracker.loaded:
+            with self.instrumentation.span('data_manager.get_budget_status.read'):
+                transactions_df = pd.read_csv(config.TRANSACTIONS_FILE, sep='\t')
+            with self.instrumentation.span('data_manager.get_budget_status.budget_rebuild'):
+                self.budget_tracker.load(transactions_df)
+            self.save_budget_spend()
+        return self.budget_tracker.remaining(on_date)
@@ -0,0 +1,98 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from . import config
+
+class Instrumentation:
+    def __init__(self, profile=False):
+        self.profile = profile
+        self._profiler = None
+        self._clear()
+
+    def _clear(self, name=None):
+        self.run_name = name
+        self.run_started = datetime.now()
+        self.spans = []
+        self.counters = {}
+
+    def reset(self, name=None):
+        """Start a new named run, profiling it until emit() when profile is set"""
+        self._stop_profiling()
+        self._clear(name)
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            tracemalloc.start()
+
+    def _stop_profiling(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+            tracemalloc.stop()
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block and record it under the given name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.spans.append({'name': name, 'duration_ms': round(duration_ms, 3)})
+
+    def increment(self, name, value=1):
+        """Add value to the named counter"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """Return the collected metrics for the current run as a dict"""
+        result = {
+            'run': self.run_name,
+            'run_started': self.run_started.strftime('%Y-%m-%d %H:%M:%S'),
+            'spans': list(self.spans),
+            'counters': dict(self.counters),
+        }
+        if self._profiler is not None:
+            result['profile'] = self._profile_summary()
+        return result
+
+    def _profile_summary(self, limit=20):
+        """Summarize cProfile hot spots and tracemalloc memory usage"""
+        self._profiler.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream)
+        stats.sort_stats('cumulative')
+
+        functions = []
+        for func in stats.fcn_list[:limit]:
+            call_count, _, total_time, cumulative_time, _ = stats.stats[func]
+            filename, line, name = func
+            functions.append({
+                'function': f"{filename}:{line}({name})",
+                'calls': call_count,
+                'total_ms': round(total_time * 1000, 3),
+                'cumulative_ms': round(cumulative_time * 1000, 3)
+            })
+        self._profiler.enable()
+
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            'functions': functions,
+            'memory_current_bytes': current,
+            'memory_peak_bytes': peak
+        }
+
+    def emit(self, path=None):
+        """Append the current run's metrics as one JSON line and end the run"""
+        path = path or config.METRICS_FILE
+        result = self.summary()
+        with open(path, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+        self._stop_profiling()
+        self._clear()
+        return result
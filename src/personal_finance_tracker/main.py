@@ -1,10 +1,13 @@
 from .plaid_client import PlaidClient
 from .data_manager import DataManager
+from .instrumentation import Instrumentation
+from . import config
 import pandas as pd
 
 def main():
-    plaid_client = PlaidClient()
-    data_manager = DataManager()
+    instrumentation = Instrumentation(profile=config.PROFILE)
+    plaid_client = PlaidClient(instrumentation)
+    data_manager = DataManager(instrumentation)
 
     print("Personal Finance Tracker")
     print("=" * 30)
@@ -14,13 +17,18 @@ def main():
         print("1. Connect new account (get link token)")
         print("2. Fetch transactions and balances")
         print("3. View current balances")
-        print("4. Exit")
+        print("4. View budget status")
+        print("5. Exit")
 
-        choice = input("\nEnter your choice (1-4): ")
+        choice = input("\nEnter your choice (1-5): ")
 
         if choice == '1':
             # In sandbox mode, you'll use the Plaid Link demo
-            link_token = plaid_client.create_link_token()
+            instrumentation.reset('create_link_token')
+            try:
+                link_token = plaid_client.create_link_token()
+            finally:
+                instrumentation.emit()
             print(f"\nLink token created: {link_token}")
             print("\nFor sandbox testing, use the Plaid Link demo:")
             print("https://plaid.com/docs/quickstart/")
@@ -28,6 +36,7 @@ def main():
 
         elif choice == '2':
             access_token = input("Enter your access token: ")
+            instrumentation.reset('fetch')
             try:
                 # Get accounts
                 accounts = plaid_client.get_accounts(access_token)
@@ -43,9 +52,16 @@ def main():
 
             except Exception as e:
                 print(f"Error fetching data: {e}")
+            finally:
+                instrumentation.emit()
+                print(f"Run metrics written to {config.METRICS_FILE}")
 
         elif choice == '3':
-            balances_df = data_manager.get_latest_balances()
+            instrumentation.reset('view_balances')
+            try:
+                balances_df = data_manager.get_latest_balances()
+            finally:
+                instrumentation.emit()
             if not balances_df.empty:
                 print("\nCurrent Account Balances:")
                 print("-" * 50)
@@ -59,6 +75,20 @@ def main():
                 print("No balance data available. Please fetch data first.")
 
         elif choice == '4':
+            instrumentation.reset('budget_status')
+            try:
+                budget_status = data_manager.get_budget_status()
+            finally:
+                instrumentation.emit()
+            if budget_status:
+                print("\nRemaining This Period:")
+                print("-" * 50)
+                for name, remaining in budget_status.items():
+                    print(f"{name}: ${remaining:.2f}")
+            else:
+                print(f"No budgets defined. Add them to {config.BUDGETS_FILE}")
+
+        elif choice == '5':
             print("Goodbye!")
             break
 
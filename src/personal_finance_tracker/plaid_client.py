@@ -10,10 +10,12 @@ from plaid.configuration import Configuration
 from plaid.api_client import ApiClient
 from plaid import Environment
 from . import config
+from .instrumentation import Instrumentation
 from datetime import datetime, timedelta
 
 class PlaidClient:
-    def __init__(self):
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation or Instrumentation()
         env_map = {
             'sandbox': Environment.Sandbox,
             'production': Environment.Production
@@ -28,6 +30,16 @@ class PlaidClient:
         api_client = ApiClient(configuration)
         self.client = plaid_api.PlaidApi(api_client)
 
+    def _call(self, method, request):
+        """Call a Plaid API method, recording its timing and outcome"""
+        self.instrumentation.increment('api_calls')
+        with self.instrumentation.span(f'plaid.{method.__name__}'):
+            try:
+                return method(request)
+            except Exception:
+                self.instrumentation.increment('api_errors')
+                raise
+
     def create_link_token(self, user_id="user_123"):
         """Create a link token for Plaid Link"""
         request = LinkTokenCreateRequest(
@@ -37,19 +49,19 @@ class PlaidClient:
             language='en',
             user=LinkTokenCreateRequestUser(client_user_id=user_id)
         )
-        response = self.client.link_token_create(request)
+        response = self._call(self.client.link_token_create, request)
         return response['link_token']
 
     def exchange_public_token(self, public_token):
         """Exchange public token for access token"""
         request = ItemPublicTokenExchangeRequest(public_token=public_token)
-        response = self.client.item_public_token_exchange(request)
+        response = self._call(self.client.item_public_token_exchange, request)
         return response['access_token']
 
     def get_accounts(self, access_token):
         """Get account information"""
         request = AccountsGetRequest(access_token=access_token)
-        response = self.client.accounts_get(request)
+        response = self._call(self.client.accounts_get, request)
         return response['accounts']
 
     def get_transactions(self, access_token, start_date=None, end_date=None):
@@ -64,5 +76,6 @@ class PlaidClient:
             start_date=start_date,
             end_date=end_date
         )
-        response = self.client.transactions_get(request)
+        response = self._call(self.client.transactions_get, request)
+        self.instrumentation.increment('transactions_fetched', len(response['transactions']))
         return response['transactions']
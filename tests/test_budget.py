@@ -0,0 +1,253 @@
+import pytest
+import pandas as pd
+from datetime import date
+from unittest.mock import patch
+from src.personal_finance_tracker.budget import BudgetTracker
+from src.personal_finance_tracker.data_manager import DataManager
+
+
+def make_row(transaction_id, amount, date='2024-01-15', category='Food and Drink, Groceries',
+             account_id='acc_123'):
+    return {
+        'transaction_id': transaction_id,
+        'account_id': account_id,
+        'amount': amount,
+        'date': date,
+        'category': category
+    }
+
+
+class TestBudgetTracker:
+    """Unit tests for BudgetTracker"""
+
+    @pytest.fixture
+    def tracker(self):
+        """Tracker with a category budget and an account-wide budget"""
+        tracker = BudgetTracker([
+            {'name': 'Food', 'category': 'Food and Drink', 'limit': 100, 'alert_threshold': 0.8},
+            {'name': 'Checking', 'account_id': 'acc_123', 'limit': 500}
+        ])
+        tracker.load(pd.DataFrame(columns=['transaction_id', 'account_id', 'amount', 'date', 'category']))
+        return tracker
+
+    def test_add_transaction_updates_spend(self, tracker):
+        """Test that added rows reduce the remaining amount in matching budgets"""
+        tracker.add_transaction(make_row('t1', 30.0))
+        tracker.add_transaction(make_row('t2', 20.0, category='Service, Subscription'))
+
+        remaining = tracker.remaining(date(2024, 1, 31))
+        assert remaining['Food'] == 70.0
+        assert remaining['Checking'] == 450.0
+
+    def test_periods_are_tracked_separately(self, tracker):
+        """Test that spend in another month does not count against this month"""
+        tracker.add_transaction(make_row('t1', 30.0, date='2023-12-31'))
+
+        assert tracker.remaining(date(2024, 1, 1))['Food'] == 100.0
+        assert tracker.remaining(date(2023, 12, 1))['Food'] == 70.0
+
+    def test_account_filter(self, tracker):
+        """Test that account budgets ignore other accounts"""
+        tracker.add_transaction(make_row('t1', 30.0, account_id='acc_other'))
+
+        remaining = tracker.remaining(date(2024, 1, 15))
+        assert remaining['Food'] == 70.0
+        assert remaining['Checking'] == 500.0
+
+    def test_inflows_do_not_count(self, tracker):
+        """Test that income and transfers in are not counted as spend"""
+        tracker.add_transaction(make_row('t1', -2000.0, category='Transfer, Payroll'))
+        tracker.add_transaction(make_row('t2', 100.0))
+
+        remaining = tracker.remaining(date(2024, 1, 15))
+        assert remaining['Checking'] == 400.0
+        assert remaining['Food'] == 0.0
+
+    def test_repeated_category_counts_once(self, tracker):
+        """Test that a repeated category does not count a budget twice"""
+        tracker.add_transaction(make_row('t1', 10.0, category='Food and Drink, Food and Drink'))
+
+        assert tracker.remaining(date(2024, 1, 15))['Food'] == 90.0
+
+    def test_threshold_alerts(self, tracker):
+        """Test that alerts fire once when spend crosses each level"""
+        assert tracker.add_transaction(make_row('t1', 50.0)) == []
+
+        alerts = tracker.add_transaction(make_row('t2', 35.0))
+        assert len(alerts) == 1
+        assert "Food" in alerts[0] and "80%" in alerts[0]
+
+        alerts = tracker.add_transaction(make_row('t3', 20.0))
+        assert len(alerts) == 1
+        assert "100%" in alerts[0]
+
+        assert tracker.add_transaction(make_row('t4', 5.0)) == []
+
+    def test_load_rebuilds_spend(self, tracker):
+        """Test that load sums stored transactions, including blank categories"""
+        df = pd.DataFrame([
+            make_row('t1', 10.0),
+            make_row('t2', 15.0, category=float('nan')),
+            make_row('t3', -500.0),
+            make_row('t4', 5.0, category='Food and Drinks'),
+            make_row('t5', 7.0, date='2024-02-01')
+        ])
+        tracker.load(df)
+
+        remaining = tracker.remaining(date(2024, 1, 15))
+        assert remaining['Food'] == 90.0
+        assert remaining['Checking'] == 470.0
+        assert tracker.remaining(date(2024, 2, 1))['Food'] == 93.0
+
+    def test_load_matches_incremental(self):
+        """Test that a rebuild gives the same totals as adding rows one by one"""
+        budgets = [
+            {'name': 'Weekly Food', 'category': 'Food and Drink', 'period': 'weekly', 'limit': 50},
+            {'name': 'Yearly', 'period': 'yearly', 'limit': 1000}
+        ]
+        rows = [
+            make_row('t1', 10.0, date='2024-01-01'),
+            make_row('t2', 20.0, date='2024-01-07'),
+            make_row('t3', 30.0, date='2024-01-08', category='Service'),
+            make_row('t4', -40.0, date='2024-01-09')
+        ]
+        incremental = BudgetTracker(budgets)
+        for row in rows:
+            incremental.add_transaction(row)
+        rebuilt = BudgetTracker(budgets)
+        rebuilt.load(pd.DataFrame(rows))
+
+        assert rebuilt.spend == incremental.spend
+
+    def test_restore_round_trip(self, tracker):
+        """Test that saved spend totals restore without a rebuild"""
+        tracker.add_transaction(make_row('t1', 30.0))
+        restored = BudgetTracker([
+            {'name': 'Food', 'category': 'Food and Drink', 'limit': 100},
+            {'name': 'Checking', 'account_id': 'acc_123', 'limit': 500}
+        ])
+        restored.restore(tracker.to_records())
+
+        assert restored.loaded
+        assert restored.spend == tracker.spend
+
+    def test_invalid_budgets(self):
+        """Test that unknown periods, missing fields and duplicate names are rejected"""
+        tracker = BudgetTracker()
+        with pytest.raises(ValueError):
+            tracker.add_budget({'name': 'Food', 'limit': 100, 'period': 'daily'})
+        with pytest.raises(ValueError):
+            tracker.add_budget({'name': float('nan'), 'limit': 100})
+        with pytest.raises(ValueError):
+            tracker.add_budget({'name': 'Food', 'limit': float('nan')})
+        tracker.add_budget({'name': 'Food', 'limit': 100})
+        with pytest.raises(ValueError):
+            tracker.add_budget({'name': 'Food', 'limit': 50})
+
+    def test_blank_period_defaults_to_monthly(self):
+        """Test that a blank period read from TSV falls back to monthly"""
+        tracker = BudgetTracker([{'name': 'Food', 'limit': 100, 'period': float('nan')}])
+        assert tracker.budgets['Food']['period'] == 'monthly'
+
+
+class TestDataManagerBudgets:
+    """Tests for budget tracking during DataManager syncs"""
+
+    @pytest.fixture
+    def data_manager(self, tmp_path):
+        """DataManager using a temporary data directory for the whole test"""
+        with patch('src.personal_finance_tracker.data_manager.config.TRANSACTIONS_FILE', tmp_path / 'transactions.tsv'):
+            with patch('src.personal_finance_tracker.data_manager.config.BALANCES_FILE', tmp_path / 'balances.tsv'):
+                with patch('src.personal_finance_tracker.data_manager.config.BUDGETS_FILE', tmp_path / 'budgets.tsv'):
+                    with patch('src.personal_finance_tracker.data_manager.config.BUDGET_SPEND_FILE', tmp_path / 'budget_spend.json'):
+                        yield DataManager()
+
+    def test_save_transactions_updates_budgets(self, data_manager, sample_transactions,
+                                               sample_accounts, capsys):
+        """Test that saving transactions updates spend and raises alerts"""
+        data_manager.add_budget('Food', 50, category='Food and Drink')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+
+        assert data_manager.get_budget_status(date(2024, 1, 20)) == {'Food': pytest.approx(4.33)}
+        assert capsys.readouterr().out.count("Budget 'Food' reached 80%") == 1
+
+    def test_budgets_persist(self, data_manager, sample_transactions, sample_accounts):
+        """Test that budgets and spend are restored by a new DataManager"""
+        data_manager.add_budget('Checking', 100, account_id='acc_123')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+
+        restored = DataManager()
+        assert restored.get_budget_status(date(2024, 1, 5)) == {'Checking': pytest.approx(54.33)}
+
+    def test_saved_spend_avoids_rebuild(self, data_manager, sample_transactions, sample_accounts,
+                                        tmp_path):
+        """Test that a new DataManager restores saved spend instead of rescanning"""
+        data_manager.add_budget('Food', 100, category='Food and Drink')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+        assert (tmp_path / 'budget_spend.json').exists()
+
+        restored = DataManager()
+        assert restored.budget_tracker.loaded
+        with patch.object(restored.budget_tracker, 'load') as load:
+            restored.save_transactions(sample_transactions, sample_accounts)
+            assert restored.get_budget_status(date(2024, 1, 20)) == {'Food': pytest.approx(54.33)}
+            load.assert_not_called()
+
+    def test_budget_edit_triggers_rebuild(self, data_manager, sample_transactions,
+                                          sample_accounts, tmp_path):
+        """Test that saved spend is ignored once the budget definitions change"""
+        data_manager.add_budget('Food', 100, category='Food and Drink')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+        with open(tmp_path / 'budgets.tsv', 'a') as f:
+            f.write('Checking\t\tacc_123\t\t200\t\n')
+
+        restored = DataManager()
+        assert not restored.budget_tracker.loaded
+        assert restored.get_budget_status(date(2024, 1, 20)) == {
+            'Food': pytest.approx(54.33),
+            'Checking': pytest.approx(154.33)
+        }
+
+    def test_mid_session_budget_edit(self, data_manager, sample_accounts, tmp_path):
+        """Test that budgets edited by hand during a session are reloaded before a sync"""
+        data_manager.add_budget('Food', 100, category='Food')
+        data_manager.save_transactions([
+            {'transaction_id': 't1', 'account_id': 'acc_123', 'amount': -20.0,
+             'date': '2024-01-10', 'name': 'Lunch', 'category': ['Food']}
+        ], sample_accounts)
+
+        budgets_file = tmp_path / 'budgets.tsv'
+        budgets_file.write_text(budgets_file.read_text().replace('\tFood\t', '\tTravel\t'))
+        data_manager.save_transactions([
+            {'transaction_id': 't2', 'account_id': 'acc_123', 'amount': -10.0,
+             'date': '2024-01-11', 'name': 'Taxi', 'category': ['Travel']}
+        ], sample_accounts)
+
+        assert data_manager.get_budget_status(date(2024, 1, 20)) == {'Food': 90.0}
+        assert DataManager().get_budget_status(date(2024, 1, 20)) == {'Food': 90.0}
+
+    def test_limit_edit_keeps_spend(self, data_manager, sample_transactions, sample_accounts,
+                                    tmp_path):
+        """Test that changing only a limit reuses the running spend"""
+        data_manager.add_budget('Food', 100, category='Food and Drink')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+
+        budgets_file = tmp_path / 'budgets.tsv'
+        budgets_file.write_text(budgets_file.read_text().replace('\t100\t', '\t200\t'))
+        with patch.object(data_manager.budget_tracker.__class__, 'load') as load:
+            assert data_manager.get_budget_status(date(2024, 1, 20)) == {
+                'Food': pytest.approx(154.33)
+            }
+            load.assert_not_called()
+
+    def test_transactions_edit_triggers_rebuild(self, data_manager, sample_transactions,
+                                                sample_accounts, tmp_path):
+        """Test that saved spend is ignored once transactions.tsv is changed elsewhere"""
+        data_manager.add_budget('Food', 100, category='Food and Drink')
+        data_manager.save_transactions(sample_transactions, sample_accounts)
+
+        transactions_file = tmp_path / 'transactions.tsv'
+        transactions_file.write_text(transactions_file.read_text().replace('45.67', '5.67'))
+        assert data_manager.get_budget_status(date(2024, 1, 20)) == {'Food': pytest.approx(94.33)}
+        assert DataManager().get_budget_status(date(2024, 1, 20)) == {'Food': pytest.approx(94.33)}
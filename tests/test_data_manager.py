@@ -25,7 +25,9 @@ class TestDataManager:
         with patch('src.personal_finance_tracker.data_manager.config.DATA_DIR', temp_data_dir):
             with patch('src.personal_finance_tracker.data_manager.config.TRANSACTIONS_FILE', transactions_file):
                 with patch('src.personal_finance_tracker.data_manager.config.BALANCES_FILE', balances_file):
-                    return DataManager()
+                    with patch('src.personal_finance_tracker.data_manager.config.BUDGETS_FILE', temp_data_dir / 'budgets.tsv'):
+                        with patch('src.personal_finance_tracker.data_manager.config.BUDGET_SPEND_FILE', temp_data_dir / 'budget_spend.json'):
+                            yield DataManager()
     
     def test_init_creates_files(self, data_manager_with_temp_dir, temp_data_dir):
         """Test that DataManager creates TSV files on initialization"""
@@ -114,8 +116,10 @@ class TestDataManager:
         with patch('src.personal_finance_tracker.data_manager.config.DATA_DIR', temp_data_dir):
             with patch('src.personal_finance_tracker.data_manager.config.TRANSACTIONS_FILE', temp_data_dir / 'transactions.tsv'):
                 with patch('src.personal_finance_tracker.data_manager.config.BALANCES_FILE', temp_data_dir / 'balances.tsv'):
-                    data_manager = DataManager()
-                    # Remove the file that was created during init
-                    (temp_data_dir / 'balances.tsv').unlink()
-                    df = data_manager.get_latest_balances()
-                    assert len(df) == 0
\ No newline at end of file
+                    with patch('src.personal_finance_tracker.data_manager.config.BUDGETS_FILE', temp_data_dir / 'budgets.tsv'):
+                        with patch('src.personal_finance_tracker.data_manager.config.BUDGET_SPEND_FILE', temp_data_dir / 'budget_spend.json'):
+                            data_manager = DataManager()
+                            # Remove the file that was created during init
+                            (temp_data_dir / 'balances.tsv').unlink()
+                            df = data_manager.get_latest_balances()
+                            assert len(df) == 0
\ No newline at end of file
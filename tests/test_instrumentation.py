@@ -0,0 +1,106 @@
+import json
+import tracemalloc
+from unittest.mock import patch
+from src.personal_finance_tracker.instrumentation import Instrumentation
+from src.personal_finance_tracker.data_manager import DataManager
+
+
+class TestInstrumentation:
+    """Unit tests for Instrumentation"""
+
+    def test_span_records_duration(self):
+        """Test that spans are recorded with their name and duration"""
+        instrumentation = Instrumentation()
+        with instrumentation.span('test.phase'):
+            pass
+
+        assert len(instrumentation.spans) == 1
+        assert instrumentation.spans[0]['name'] == 'test.phase'
+        assert instrumentation.spans[0]['duration_ms'] >= 0
+
+    def test_span_records_on_error(self):
+        """Test that a span is still recorded when the block raises"""
+        instrumentation = Instrumentation()
+        try:
+            with instrumentation.span('test.failing'):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert [s['name'] for s in instrumentation.spans] == ['test.failing']
+
+    def test_increment_counters(self):
+        """Test counter accumulation"""
+        instrumentation = Instrumentation()
+        instrumentation.increment('api_calls')
+        instrumentation.increment('api_calls')
+        instrumentation.increment('bytes_written', 128)
+
+        assert instrumentation.counters == {'api_calls': 2, 'bytes_written': 128}
+
+    def test_emit_writes_json_line(self, tmp_path):
+        """Test that emit appends one JSON line per run and resets state"""
+        metrics_file = tmp_path / 'metrics.jsonl'
+        instrumentation = Instrumentation()
+
+        instrumentation.reset('fetch')
+        instrumentation.increment('rows_ingested', 3)
+        with instrumentation.span('test.phase'):
+            pass
+        instrumentation.emit(metrics_file)
+        instrumentation.emit(metrics_file)
+
+        lines = metrics_file.read_text().splitlines()
+        assert len(lines) == 2
+        first = json.loads(lines[0])
+        assert first['run'] == 'fetch'
+        assert first['counters'] == {'rows_ingested': 3}
+        assert first['spans'][0]['name'] == 'test.phase'
+        assert 'profile' not in first
+        assert json.loads(lines[1])['counters'] == {}
+
+    def test_profile_mode(self, tmp_path):
+        """Test that profiling covers only the run between reset and emit"""
+        instrumentation = Instrumentation(profile=True)
+        assert not tracemalloc.is_tracing()
+        try:
+            instrumentation.reset('fetch')
+            assert tracemalloc.is_tracing()
+            sorted(range(1000))
+            result = instrumentation.emit(tmp_path / 'metrics.jsonl')
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+        assert result['profile']['functions']
+        assert result['profile']['memory_peak_bytes'] >= 0
+        assert not tracemalloc.is_tracing()
+
+    def test_data_manager_spans_and_counters(self, tmp_path, sample_transactions, sample_accounts):
+        """Test that DataManager records its phases and row/byte counters, including budgets"""
+        instrumentation = Instrumentation()
+        with patch('src.personal_finance_tracker.data_manager.config.TRANSACTIONS_FILE', tmp_path / 'transactions.tsv'):
+            with patch('src.personal_finance_tracker.data_manager.config.BALANCES_FILE', tmp_path / 'balances.tsv'):
+                with patch('src.personal_finance_tracker.data_manager.config.BUDGETS_FILE', tmp_path / 'budgets.tsv'):
+                    with patch('src.personal_finance_tracker.data_manager.config.BUDGET_SPEND_FILE', tmp_path / 'budget_spend.json'):
+                        data_manager = DataManager(instrumentation)
+                        data_manager.add_budget('Food', 100, category='Food and Drink')
+                        instrumentation.reset()
+                        data_manager.save_transactions(sample_transactions, sample_accounts)
+                        data_manager.save_balances(sample_accounts)
+
+        assert [s['name'] for s in instrumentation.spans] == [
+            'data_manager.save_transactions.read',
+            'data_manager.save_transactions.budget_rebuild',
+            'data_manager.save_transactions.transform',
+            'data_manager.save_transactions.write',
+            'data_manager.save_budget_spend.write',
+            'data_manager.save_balances.transform',
+            'data_manager.save_balances.write'
+        ]
+        assert instrumentation.counters['rows_ingested'] == 1
+        expected_bytes = sum(
+            (tmp_path / name).stat().st_size
+            for name in ['transactions.tsv', 'budget_spend.json', 'balances.tsv']
+        )
+        assert instrumentation.counters['bytes_written'] == expected_bytes
@@ -87,31 +87,33 @@ class TestEndToEndFlow:
         with patch('src.personal_finance_tracker.config.DATA_DIR', temp_data_dir):
             with patch('src.personal_finance_tracker.config.TRANSACTIONS_FILE', temp_data_dir / 'transactions.tsv'):
                 with patch('src.personal_finance_tracker.config.BALANCES_FILE', temp_data_dir / 'balances.tsv'):
+                    with patch('src.personal_finance_tracker.config.BUDGETS_FILE', temp_data_dir / 'budgets.tsv'):
+                        with patch('src.personal_finance_tracker.config.BUDGET_SPEND_FILE', temp_data_dir / 'budget_spend.json'):
                     
-                    data_manager = DataManager()
+                            data_manager = DataManager()
                     
-                    # Simulate the complete flow
-                    # 1. Create link token
-                    link_token = mock_plaid_client.create_link_token()
-                    assert link_token == "link-sandbox-test-token"
+                            # Simulate the complete flow
+                            # 1. Create link token
+                            link_token = mock_plaid_client.create_link_token()
+                            assert link_token == "link-sandbox-test-token"
                     
-                    # 2. Exchange public token (simulated)
-                    access_token = mock_plaid_client.exchange_public_token("public-test-token")
-                    assert access_token == "access-sandbox-test-token"
+                            # 2. Exchange public token (simulated)
+                            access_token = mock_plaid_client.exchange_public_token("public-test-token")
+                            assert access_token == "access-sandbox-test-token"
                     
-                    # 3. Get accounts and transactions
-                    accounts = mock_plaid_client.get_accounts(access_token)
-                    transactions = mock_plaid_client.get_transactions(access_token)
+                            # 3. Get accounts and transactions
+                            accounts = mock_plaid_client.get_accounts(access_token)
+                            transactions = mock_plaid_client.get_transactions(access_token)
                     
-                    # 4. Save data
-                    data_manager.save_transactions(transactions, accounts)
-                    data_manager.save_balances(accounts)
+                            # 4. Save data
+                            data_manager.save_transactions(transactions, accounts)
+                            data_manager.save_balances(accounts)
                     
-                    # 5. Verify data was saved correctly
-                    saved_balances = data_manager.get_latest_balances()
-                    assert len(saved_balances) == 2  # Two accounts from mock
-                    assert saved_balances.iloc[0]['account_name'] == 'Test Checking Account'
-                    assert saved_balances.iloc[1]['account_name'] == 'Test Credit Card'
+                            # 5. Verify data was saved correctly
+                            saved_balances = data_manager.get_latest_balances()
+                            assert len(saved_balances) == 2  # Two accounts from mock
+                            assert saved_balances.iloc[0]['account_name'] == 'Test Checking Account'
+                            assert saved_balances.iloc[1]['account_name'] == 'Test Credit Card'
     
     @pytest.fixture
     def temp_data_dir(self):
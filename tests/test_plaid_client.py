@@ -78,4 +78,19 @@ class TestPlaidClientReal:
                     assert 'host' in call_args.kwargs
                     assert 'api_key' in call_args.kwargs
                     assert call_args.kwargs['api_key']['clientId'] == 'test_client_id'
-                    assert call_args.kwargs['api_key']['secret'] == 'test_secret'
\ No newline at end of file
+                    assert call_args.kwargs['api_key']['secret'] == 'test_secret'
+
+    def test_api_calls_are_instrumented(self, mock_config, mock_api_client, mock_plaid_api):
+        """Test that Plaid calls are counted and timed, including failures"""
+        api = mock_plaid_api.return_value
+        api.accounts_get = Mock(__name__='accounts_get', return_value={'accounts': []})
+        api.transactions_get = Mock(__name__='transactions_get', side_effect=Exception("API error"))
+        client = PlaidClient()
+
+        client.get_accounts("access-token-123")
+        with pytest.raises(Exception):
+            client.get_transactions("access-token-123")
+
+        assert client.instrumentation.counters == {'api_calls': 2, 'api_errors': 1}
+        span_names = [s['name'] for s in client.instrumentation.spans]
+        assert span_names == ['plaid.accounts_get', 'plaid.transactions_get']